@@ -3,31 +3,59 @@ A&I ARMOUR - FastAPI Server
 REST API + WebSocket for real-time dashboard updates
 """
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi import FastAPI, Request, Response, WebSocket, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from pydantic import BaseModel
 from typing import List, Dict, Optional
 import asyncio
-import json
-from datetime import datetime
+import hashlib
+import msgspec
+import orjson
+import os
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+import redis.asyncio as aioredis
 import uvicorn
 
 from backend import (
-    AIArmourSystem, 
+    AIArmourSystem,
     AgentType,
-    Lead, 
+    Lead,
     LeadStatus,
     Invoice,
-    Installation
+    Installation,
+    to_dict
 )
 
 # ============================================================================
 # FASTAPI APP
 # ============================================================================
 
-app = FastAPI(title="A&I ARMOUR API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start/stop background machinery alongside the server"""
+    global _redis, _subscriber_task
+    ai_system.db.start_writer()
+    app.state.http = ai_system.http
+    if REDIS_URL:
+        _redis = aioredis.from_url(REDIS_URL)
+        _subscriber_task = asyncio.create_task(_redis_subscriber())
+    yield
+    if _subscriber_task is not None:
+        _subscriber_task.cancel()
+        _subscriber_task = None
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+    await ai_system.db.stop_writer()
+    await ai_system.shutdown()
+
+# orjson serializes responses several times faster than stdlib json
+app = FastAPI(title="A&I ARMOUR API", version="1.0.0",
+              default_response_class=ORJSONResponse, lifespan=lifespan)
 
 # CORS for frontend
 app.add_middleware(
@@ -42,7 +70,15 @@ app.add_middleware(
 ai_system = AIArmourSystem()
 
 # WebSocket connections for real-time updates
-active_connections: List[WebSocket] = []
+active_connections: set = set()
+
+# With REDIS_URL set, broadcasts go through Redis pub/sub so every Uvicorn
+# worker (and every host) fans out to its own local connections - the only
+# way dashboards keep working with WEB_CONCURRENCY > 1
+REDIS_URL = os.environ.get("REDIS_URL", "")
+BROADCAST_CHANNEL = "aiarmour:broadcast"
+_redis: Optional[aioredis.Redis] = None
+_subscriber_task: Optional[asyncio.Task] = None
 
 # ============================================================================
 # PYDANTIC MODELS (Request/Response)
@@ -74,6 +110,18 @@ class InstallationCreate(BaseModel):
     box_serial_numbers: List[str]
     notes: Optional[str] = ""
 
+# msgspec mirror of LeadCreate for the trusted internal path - decodes and
+# type-checks the same shape ~6x faster than Pydantic
+class LeadPayload(msgspec.Struct):
+    name: str
+    email: str
+    source: str
+    estimated_value: float
+    company: Optional[str] = None
+    phone: Optional[str] = None
+
+_lead_decoder = msgspec.json.Decoder(LeadPayload)
+
 # ============================================================================
 # WEBSOCKET FOR REAL-TIME UPDATES
 # ============================================================================
@@ -82,26 +130,48 @@ class InstallationCreate(BaseModel):
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket connection for real-time dashboard updates"""
     await websocket.accept()
-    active_connections.append(websocket)
-    
+    active_connections.add(websocket)
+
     try:
-        while True:
-            # Keep connection alive and send updates
-            data = await websocket.receive_text()
-            
+        # iter_text() handles the disconnect internally - no exception-driven
+        # exit path on every closed connection
+        async for data in websocket.iter_text():
             # Echo back for now (in production, process commands)
             await websocket.send_text(f"Received: {data}")
-            
-    except WebSocketDisconnect:
-        active_connections.remove(websocket)
+    finally:
+        active_connections.discard(websocket)
+
+async def _local_broadcast(frame: str):
+    """Fan a pre-encoded frame out to this worker's connections"""
+    # Concurrent sends - one slow dashboard shouldn't stall the rest
+    conns = list(active_connections)
+    results = await asyncio.gather(
+        *(connection.send_text(frame) for connection in conns),
+        return_exceptions=True
+    )
+    for connection, result in zip(conns, results):
+        if isinstance(result, Exception):
+            active_connections.discard(connection)
+
+async def _redis_subscriber():
+    """Relay frames published by any worker to this worker's connections"""
+    pubsub = _redis.pubsub()
+    await pubsub.subscribe(BROADCAST_CHANNEL)
+    async for message in pubsub.listen():
+        if message["type"] == "message":
+            data = message["data"]
+            if isinstance(data, bytes):
+                data = data.decode()
+            await _local_broadcast(data)
 
 async def broadcast_update(message: Dict):
     """Broadcast update to all connected dashboards"""
-    for connection in active_connections:
-        try:
-            await connection.send_json(message)
-        except:
-            active_connections.remove(connection)
+    # Encode once - send_json would re-encode the same payload per client
+    frame = orjson.dumps(message).decode()
+    if _redis is not None:
+        await _redis.publish(BROADCAST_CHANNEL, frame)
+    else:
+        await _local_broadcast(frame)
 
 # ============================================================================
 # REST API ENDPOINTS
@@ -112,10 +182,30 @@ async def root():
     """Serve the dashboard"""
     return FileResponse("dashboard.html")
 
+# Every connected dashboard polls this endpoint; serve repeat requests from a
+# short-lived cache and let unchanged clients short-circuit to a 304
+_DASHBOARD_TTL = 1.0
+_dashboard_cache = {"expires": 0.0, "payload": b"", "etag": ""}
+
 @app.get("/api/dashboard")
-async def get_dashboard_data():
+async def get_dashboard_data(request: Request):
     """Get current dashboard metrics"""
-    return ai_system.get_dashboard_data()
+    cache = _dashboard_cache
+    now = time.monotonic()
+    if now >= cache["expires"]:
+        # One HGETALL per rebuild window keeps multi-worker counters in sync
+        await ai_system.refresh_counters()
+        payload = orjson.dumps(ai_system.get_dashboard_data())
+        cache["payload"] = payload
+        cache["etag"] = hashlib.blake2b(payload, digest_size=8).hexdigest()
+        cache["expires"] = now + _DASHBOARD_TTL
+
+    if request.headers.get("if-none-match") == cache["etag"]:
+        # RFC 9110: the 304 carries the same ETag the 200 would, so
+        # intermediary caches can revalidate their stored entries
+        return Response(status_code=304, headers={"ETag": cache["etag"]})
+    return Response(content=cache["payload"], media_type="application/json",
+                    headers={"ETag": cache["etag"]})
 
 @app.post("/api/command")
 async def execute_command(request: CommandRequest):
@@ -135,47 +225,63 @@ async def execute_command(request: CommandRequest):
 @app.get("/api/agents/status")
 async def get_agents_status():
     """Get status of all AI agents"""
-    return {
-        agent_type.value: {
-            "active": agent.is_active,
-            "type": agent_type.value
-        }
-        for agent_type, agent in ai_system.agents.items()
-    }
+    return ai_system.get_agents_status()
 
 # ============================================================================
 # SALES ENDPOINTS
 # ============================================================================
 
-@app.post("/api/leads")
-async def create_lead(lead_data: LeadCreate):
-    """Create new lead and let AI agent process it"""
+async def _create_lead(lead_data: LeadCreate):
+    """Build the lead, hand it to the sales agent, notify dashboards"""
+    now = datetime.now()
+    # time_ns(): one cheap int, nanosecond-unique, no float formatting
     lead = Lead(
-        id=f"LEAD-{datetime.now().timestamp()}",
+        id=f"LEAD-{time.time_ns()}",
         name=lead_data.name,
         email=lead_data.email,
         company=lead_data.company,
         phone=lead_data.phone,
         status=LeadStatus.WARM,
         source=lead_data.source,
-        created_at=datetime.now(),
-        last_contact=datetime.now(),
+        created_at=now,
+        last_contact=now,
         notes=[],
         estimated_value=lead_data.estimated_value
     )
-    
+
     # Let sales agent process
     sales_agent = ai_system.agents[AgentType.SALES]
     result = await sales_agent.send_quote(lead)
-    
+
+    if isinstance(lead_data, LeadCreate):
+        lead_payload = lead_data.dict()
+    else:
+        lead_payload = msgspec.to_builtins(lead_data)
+
+    ai_system.incr_counter("enquiries")
     await broadcast_update({
         "type": "new_lead",
-        "lead": lead_data.dict(),
-        "timestamp": datetime.now().isoformat()
+        "lead": lead_payload,
+        "timestamp": now.isoformat()
     })
-    
+
     return {"status": "success", "lead_id": lead.id, "result": result}
 
+@app.post("/api/leads")
+async def create_lead(lead_data: LeadCreate):
+    """Create new lead and let AI agent process it"""
+    return await _create_lead(lead_data)
+
+@app.post("/api/internal/leads")
+async def create_lead_internal(request: Request):
+    """Fast path for trusted internal callers (agents, schedulers).
+
+    Decodes the body with msgspec instead of Pydantic - same shape as
+    LeadCreate at a fraction of the decode cost. External traffic goes
+    through /api/leads.
+    """
+    return await _create_lead(_lead_decoder.decode(await request.body()))
+
 @app.get("/api/leads")
 async def get_leads():
     """Get all leads"""
@@ -199,13 +305,14 @@ async def follow_up_lead(lead_id: str):
 @app.post("/api/invoices")
 async def create_invoice(invoice_data: InvoiceCreate):
     """Create and send invoice"""
+    now = datetime.now()
     invoice = Invoice(
-        id=f"INV-{int(datetime.now().timestamp())}",
+        id=f"INV-{time.time_ns()}",
         client_name=invoice_data.client_name,
         amount=invoice_data.amount,
         status="sent",
-        sent_date=datetime.now(),
-        due_date=datetime.now() + timedelta(days=invoice_data.due_days),
+        sent_date=now,
+        due_date=now + timedelta(days=invoice_data.due_days),
         paid_date=None,
         items=invoice_data.items
     )
@@ -213,13 +320,14 @@ async def create_invoice(invoice_data: InvoiceCreate):
     finance_agent = ai_system.agents[AgentType.FINANCE]
     result = await finance_agent.execute_task(
         f"Send invoice {invoice.id}",
-        {"invoice": invoice.__dict__}
+        {"invoice": to_dict(invoice)}
     )
     
+    ai_system.incr_counter("invoices_sent")
     await broadcast_update({
         "type": "invoice_sent",
         "invoice_id": invoice.id,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now.isoformat()
     })
     
     return {"status": "success", "invoice_id": invoice.id}
@@ -271,8 +379,9 @@ async def reorder_inventory(quantity: int = 10):
 @app.post("/api/installations")
 async def schedule_installation(install_data: InstallationCreate):
     """Schedule new installation"""
+    now = datetime.now()
     installation = Installation(
-        id=f"INST-{int(datetime.now().timestamp())}",
+        id=f"INST-{time.time_ns()}",
         client_name=install_data.client_name,
         address=install_data.address,
         scheduled_date=datetime.fromisoformat(install_data.scheduled_date),
@@ -285,10 +394,11 @@ async def schedule_installation(install_data: InstallationCreate):
     contractor_agent = ai_system.agents[AgentType.CONTRACTOR]
     result = await contractor_agent.schedule_installation(installation)
     
+    ai_system.incr_counter("bookings")
     await broadcast_update({
         "type": "installation_scheduled",
         "installation_id": installation.id,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now.isoformat()
     })
     
     return {"status": "success", "installation_id": installation.id}
@@ -330,8 +440,9 @@ async def get_system_health():
 @app.post("/api/system/start-autonomous")
 async def start_autonomous_mode():
     """Start the system in fully autonomous mode"""
-    # Run in background task
-    asyncio.create_task(ai_system.start_autonomous_mode())
+    # Run in background task; Uvicorn keeps its signal handlers and owns
+    # process teardown through the lifespan
+    asyncio.create_task(ai_system.start_autonomous_mode(standalone=False))
     
     await broadcast_update({
         "type": "system_status",
@@ -367,12 +478,6 @@ async def check_emails():
     })
     return result
 
-import os
-
-if __name__ == "__main__":
-    port = int(os.environ.get("PORT", 8000))
-    app.run(host="0.0.0.0", port=port)
-
 if __name__ == "__main__":
     print("""
     ╔═══════════════════════════════════════════════════════════╗
@@ -385,5 +490,21 @@ if __name__ == "__main__":
     ║                                                           ║
     ╚═══════════════════════════════════════════════════════════╝
     """)
-    
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
+
+    port = int(os.environ.get("PORT", 8000))
+    # Scale across cores with WEB_CONCURRENCY (e.g. WEB_CONCURRENCY=$(nproc)).
+    # Defaults to 1; set REDIS_URL as well so broadcasts reach dashboards on
+    # every worker instead of just the one that handled the request
+    workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+    # uvloop + httptools + websockets come from uvicorn[standard] and give
+    # 2-4x event loop / HTTP parse throughput over the pure-Python defaults
+    uvicorn.run(
+        "api_server:app",
+        host="0.0.0.0",
+        port=port,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        ws="websockets",
+        log_level="info",
+    )
@@ -0,0 +1,30 @@
+"""
+A&I ARMOUR - Optional compiled build of the agent backend
+
+backend.py is pure Python and runs fine as-is. Compiling it with Cython is
+worth roughly 30% CPU on the agent dispatch / logging hot paths with no
+source changes:
+
+    pip install cython
+    python setup.py build_ext --inplace
+
+The generated .so shadows backend.py when present; delete it to get the
+interpreted module back during development.
+"""
+
+from setuptools import setup
+
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    # Cython not installed - plain pure-Python install
+    ext_modules = []
+else:
+    ext_modules = cythonize(["backend.py"], language_level=3)
+
+setup(
+    name="aiarmour",
+    version="1.0.0",
+    py_modules=["backend", "api_server"],
+    ext_modules=ext_modules,
+)
@@ -0,0 +1,59 @@
+"""
+A&I ARMOUR - Celery task queue
+
+Durable, horizontally scalable execution for agent work. With
+AIARMOUR_QUEUE set, manual_command enqueues run_agent_task here instead of
+awaiting the agent inline: Celery workers pull from Redis, retry transient
+failures, and in-flight work survives API process restarts.
+
+Run a worker with:
+
+    celery -A tasks worker --loglevel=info
+
+Requires a Redis broker (CELERY_BROKER_URL, default redis://localhost:6379/0).
+"""
+
+import asyncio
+import os
+
+from celery import Celery
+
+app = Celery(
+    "aiarmour",
+    broker=os.environ.get("CELERY_BROKER_URL", "redis://localhost:6379/0"),
+    backend=os.environ.get("CELERY_RESULT_BACKEND", "redis://localhost:6379/1"),
+)
+
+# One event loop and one AIArmourSystem per worker process, both built
+# lazily on the first task so worker spawn stays cheap. The loop must be
+# long-lived: the shared httpx pool's keep-alive connections (and the
+# asyncio locks/semaphores) bind to the loop they first run on, so a fresh
+# asyncio.run() per task would leave the second task on a closed loop.
+_loop = None
+_system = None
+
+def _get_loop():
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+    return _loop
+
+def _get_system():
+    global _system
+    if _system is None:
+        from backend import AIArmourSystem
+        _system = AIArmourSystem()
+    return _system
+
+@app.task(bind=True, max_retries=3, default_retry_delay=5)
+def run_agent_task(self, agent_type: str, task_name: str, payload: dict):
+    """Run one agent task to completion on a worker"""
+    from backend import AgentType
+
+    loop = _get_loop()
+    system = _get_system()
+    agent = system.agents[AgentType(agent_type)]
+    try:
+        return loop.run_until_complete(agent.execute_task(task_name, payload))
+    except Exception as exc:
+        raise self.retry(exc=exc)